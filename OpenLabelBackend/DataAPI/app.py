@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Final
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from rich.logging import RichHandler
 
 from .config import CONFIG
@@ -39,7 +40,9 @@ async def lifespan(app: FastAPI):
     # shutdown
 
 
-APP: Final[FastAPI] = FastAPI(lifespan=lifespan)
+# orjson encodes the (already JSON-compatible) response content much faster than the
+# stdlib json module, which matters for large listings and base64 file payloads
+APP: Final[FastAPI] = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 for router in ROUTERS:
     APP.include_router(router)
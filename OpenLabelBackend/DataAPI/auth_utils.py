@@ -1,6 +1,7 @@
 import datetime
 
 import jwt
+from bson.objectid import ObjectId
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
@@ -10,7 +11,7 @@ from .config import CONFIG
 ALGORITHM = "HS256"
 
 
-def generate_token(user_id: str) -> str:
+def generate_token(user_id: ObjectId) -> str:
     now = datetime.datetime.now(datetime.timezone.utc)
     payload = {
         "userId": str(user_id),
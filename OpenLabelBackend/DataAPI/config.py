@@ -15,6 +15,14 @@ class _Config(BaseSettings):
     auth_secret_key: str = secrets.token_urlsafe(32)
     temp_dir: str = str((Path(__file__).parent / "temp").resolve())
 
+    # size of the chunks files are split into when stored in GridFS; larger chunks mean
+    # fewer documents (and less overhead) per file, at the cost of coarser reads
+    gridfs_chunk_size: int = 255 * 1024
+
+    # bcrypt work factor for new password hashes; each increment doubles hashing time.
+    # existing hashes keep the cost they were created with, so this can change freely
+    bcrypt_rounds: int = 10
+
     # TODO: (optional) get env file setup
     # model_config = SettingsConfigDict(env_file=Path("insert_path_here"))
 
@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, Iterable
 
 from bson.objectid import ObjectId
 from pymongo.client_session import ClientSession
@@ -11,7 +11,9 @@ from .. import exceptions as exc
 def item_exists(
     collection: Collection, item_id: ObjectId, session: ClientSession | None = None
 ):
-    return collection.find_one({"_id": item_id}, session=session) is not None
+    return (
+        collection.find_one({"_id": item_id}, {"_id": 1}, session=session) is not None
+    )
 
 
 class _ExistsChecker:
@@ -50,7 +52,66 @@ class _ExistsChecker:
 
         return True
 
+    def all_exist(
+        self,
+        db: Database,
+        item_ids: Iterable[ObjectId],
+        error: bool = False,
+        session: ClientSession | None = None,
+    ):
+        """
+        Returns `True` if all the items exist, `False` otherwise, using a single query. If `error`
+        is `True`, raises a ResourceException naming a missing item instead of returning.
+
+        Args:
+            db: The pymongo Database object to use.
+            item_ids: The IDs of the items for which to check existence.
+            error: Whether to raise an error upon an item not existing. Defaults to False.
+            session: The pymongo ClientSession to use. Defaults to None.
+
+        Raises:
+            ResourceError: if `error` is `True` and any of the specified items do not exist.
+        """
+        item_ids = set(item_ids)
+        found = {
+            item["_id"]
+            for item in db[self.collection].find(
+                {"_id": {"$in": list(item_ids)}}, {"_id": 1}, session=session
+            )
+        }
+
+        missing = item_ids - found
+        if missing:
+            if error:
+                raise exc.ResourceNotFound(
+                    f"{self.item_name} with ID '{str(next(iter(missing)))}' not found"
+                )
+            return False
+
+        return True
+
 
 project_exists = _ExistsChecker("projects", "Project")
 user_exists = _ExistsChecker("users", "User")
 annotation_exists = _ExistsChecker("annotations", "Annotation")
+file_exists = _ExistsChecker("files.files", "File")
+
+
+def projects_and_users_exist(
+    db: Database,
+    pairs: Iterable[tuple[ObjectId, ObjectId]],
+    session: ClientSession | None = None,
+):
+    """Ensures every project and user referenced by `pairs` exists, using one query per collection.
+
+    Args:
+        db: The pymongo Database object to use.
+        pairs: (project ID, user ID) pairs to check.
+        session: The pymongo ClientSession to use. Defaults to None.
+
+    Raises:
+        ResourceError: if any of the specified projects or users do not exist.
+    """
+    pairs = list(pairs)
+    project_exists.all_exist(db, (p for p, _ in pairs), True, session=session)
+    user_exists.all_exist(db, (u for _, u in pairs), True, session=session)
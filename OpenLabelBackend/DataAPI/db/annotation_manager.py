@@ -1,6 +1,7 @@
 import datetime
 
 from bson.objectid import ObjectId
+from pydantic import TypeAdapter
 from pymongo.client_session import ClientSession
 
 from .. import exceptions as exc
@@ -9,6 +10,9 @@ from . import _utils
 from .db_manager import MongoDBManager
 from .file_manager import FileManager
 
+# validates whole lists at once, dispatching on the "type" discriminator
+_ANNOTATION_LIST = TypeAdapter(list[models.Annotation])
+
 
 class AnnotationManager:
     """Annotation management for OpenLabel"""
@@ -61,8 +65,7 @@ class AnnotationManager:
             exc.ResourceNotFound: If either the provided file or project does not exist.
         """
         # Ensure the file exists
-        if not self.file_man.get_file_by_id(file_id, session=session):
-            raise exc.ResourceNotFound(f"Image with ID '{str(file_id)}' not found")
+        _utils.file_exists(self.db, file_id, error=True, session=session)
 
         # Check if user has permission to annotate in this project
         _utils.project_exists(self.db, project_id, error=True, session=session)
@@ -199,10 +202,7 @@ class AnnotationManager:
         annotations = self.db.annotations.find(
             {"fileId": file_id}, session=session
         ).limit(limit)
-        return [
-            models.get_annotation_model(ann["type"]).model_validate(ann)
-            for ann in annotations
-        ]
+        return _ANNOTATION_LIST.validate_python(list(annotations))
 
     def get_annotations_by_project(
         self, project_id: ObjectId, limit: int = 0, session: ClientSession | None = None
@@ -217,10 +217,7 @@ class AnnotationManager:
         annotations = self.db.annotations.find(
             {"projectId": project_id}, session=session
         ).limit(limit)
-        return [
-            models.get_annotation_model(ann["type"]).model_validate(ann)
-            for ann in annotations
-        ]
+        return _ANNOTATION_LIST.validate_python(list(annotations))
 
     def get_annotation_by_id(
         self, annotation_id: ObjectId, session: ClientSession | None = None
@@ -275,10 +272,10 @@ class AnnotationManager:
             new_type = update_data["type"]
             update_data["type"] = new_type.value
 
-            if new_type != annotation.type:
-                if annotation.type == models.AnnotationType.OBJECT_DETECTION:
+            if new_type is not annotation.type:
+                if annotation.type is models.AnnotationType.OBJECT_DETECTION:
                     unset = {"bbox": ""}
-                elif annotation.type == models.AnnotationType.SEGMENTATION:
+                elif annotation.type is models.AnnotationType.SEGMENTATION:
                     unset = {"points": ""}
 
         instruction = {"$set": update_data}
@@ -318,7 +315,7 @@ class AnnotationManager:
 
         # Check if this was the last annotation for the image
         annotations_count = self.db.annotations.count_documents(
-            {"fileId": annotation["fileId"]}, session=session
+            {"fileId": annotation["fileId"]}, limit=1, session=session
         )
 
         if annotations_count == 0:
@@ -68,16 +68,26 @@ ROLES = [
 ]
 
 
+# (connection URI, database name) pairs whose indexes were already created by this process
+_INDEXED_DATABASES: set[tuple[str, str]] = set()
+
+
 class MongoDBManager:
     """MongoDB database manager for OpenLabel"""
 
     def __init__(self, connection_uri: str, database_name: str = "openlabel_db"):
         """Initialize MongoDB connection"""
+        # roles are effectively static reference data, so lookups are cached in-process
+        self._roles_by_name: dict[str, Role] = {}
+        self._roles_by_id: dict[ObjectId, Role] = {}
+
         try:
             self.client = MongoClient(connection_uri)
             self.db = self.client[database_name]
-            # Create indexes for collections
-            self._create_indexes()
+            # Create indexes for collections, once per database per process
+            if (connection_uri, database_name) not in _INDEXED_DATABASES:
+                self._create_indexes()
+                _INDEXED_DATABASES.add((connection_uri, database_name))
             logger.info("MongoDB connection established successfully")
         except Exception as e:
             logger.exception(f"MongoDB connection failed: {str(e)}")
@@ -89,9 +99,20 @@ class MongoDBManager:
         self.db.users.create_index("username", unique=True)
         self.db.users.create_index("email", unique=True)
 
+        # User preferences collection indexes; every preferences read and update is by user
+        self.db.userPreferences.create_index("userId", unique=True)
+
+        # Roles collection indexes
+        self.db.roles.create_index("name", unique=True)
+
         # Projects collection indexes
         self.db.projects.create_index("name")
         self.db.projects.create_index("createdBy")
+        # project names are unique per creator
+        self.db.projects.create_index(
+            [("createdBy", pymongo.ASCENDING), ("name", pymongo.ASCENDING)],
+            unique=True,
+        )
         self.db.projects.create_index([("members.userId", pymongo.ASCENDING)])
 
         # Images collection indexes
@@ -100,6 +121,17 @@ class MongoDBManager:
             [("projectId", pymongo.ASCENDING), ("status", pymongo.ASCENDING)]
         )
 
+        # GridFS indexes; FileManager writes chunks directly, so GridIn never creates these
+        self.db["files.chunks"].create_index(
+            [("files_id", pymongo.ASCENDING), ("n", pymongo.ASCENDING)], unique=True
+        )
+        self.db["files.files"].create_index(
+            [
+                ("metadata.projectId", pymongo.ASCENDING),
+                ("metadata.type", pymongo.ASCENDING),
+            ]
+        )
+
         # Annotations collection indexes
         self.db.annotations.create_index("fileId")
         self.db.annotations.create_index(
@@ -113,10 +145,11 @@ class MongoDBManager:
         """Initialize default roles if they don't exist"""
 
         for role in ROLES:
-            existing_role = self.db.roles.find_one({"name": role.name})
+            existing_role = self.db.roles.find_one({"name": role.name}, {"_id": 1})
             if not existing_role:
                 # the mode="json" ensures the Action enums are converted to normal strings
                 self.db.roles.insert_one(role.model_dump(mode="json"))
+                self.invalidate_role_cache()
                 print(f"Created role: {role.name}")
 
     def get_roles(self) -> list[Role]:
@@ -142,20 +175,40 @@ class MongoDBManager:
 
         return Role.model_validate(raw_role)
 
+    def invalidate_role_cache(self):
+        """Clears cached roles. Must be called whenever roles are modified."""
+        self._roles_by_name.clear()
+        self._roles_by_id.clear()
+
+    def _cache_role(self, role: Role | None) -> Role | None:
+        """Adds `role` to the role cache, if it is not None, and returns it."""
+        if role is not None:
+            self._roles_by_name[role.name.value] = role
+            self._roles_by_id[role.roleId] = role
+        return role
+
     def get_role_by_id(self, role_id: ObjectId) -> Role | None:
         """Returns a single Role by its ID, or None if the role does not exist.
 
         Args:
             role_id: The ID of the role to fetch.
         """
+        if role_id in self._roles_by_id:
+            return self._roles_by_id[role_id]
+
         role = self.db.roles.find_one({"_id": role_id})
-        return self._convert_to_role_model(role)
+        return self._cache_role(self._convert_to_role_model(role))
 
-    def get_role_by_name(self, role_name: RoleName) -> Role | None:
+    def get_role_by_name(self, role_name: RoleName | str) -> Role | None:
         """Returns a single Role by its name, or None if the role does not exist.
 
         Args:
-            role_id: The ID of the role to fetch.
+            role_name: The name of the role to fetch.
         """
-        role = self.db.roles.find_one({"name": role_name})
-        return self._convert_to_role_model(role)
+        # enum members hash differently than their values, so normalize the key
+        key = role_name.value if isinstance(role_name, RoleName) else role_name
+        if key in self._roles_by_name:
+            return self._roles_by_name[key]
+
+        role = self.db.roles.find_one({"name": key})
+        return self._cache_role(self._convert_to_role_model(role))
@@ -130,17 +130,16 @@ class _COCOExporter(_ExportStrategy):
         Returns:
             A Mapping mapping File ID to a pair containing that file's meta and the generate COCO image ID.
         """
-        files = self.file_man.get_files_by_project(project.projectId)
+        # COCO is for image files only
+        files = self.file_man.get_files_by_project(
+            project.projectId, data_type=models.DataType.IMAGE
+        )
 
         image_map: dict[str, tuple[models.FileMeta, int]] = {}
         coco_images = []
         image_id = 0
 
         for f in files:
-            # COCO is for image files only
-            if f.type != models.DataType.IMAGE:
-                continue
-
             # create COCO image entry
             image_map[str(f.fileId)] = (f, image_id)
             file_name = f"{str(f.fileId)}{Path(f.filename).suffix}"
@@ -155,11 +154,9 @@ class _COCOExporter(_ExportStrategy):
             )
             image_id += 1
 
-            # Download file
-            data, _ = self.file_man.download_file(f.fileId)
-
-            # Write file to zip
-            zip_file.writestr(file_name, data.getvalue())
+            # Download file directly into the zip
+            with zip_file.open(file_name, "w") as entry:
+                self.fs.download_to_stream(f.fileId, entry)
 
         manifest["images"] = coco_images
 
@@ -200,7 +197,7 @@ class _COCOExporter(_ExportStrategy):
                 categories.append(dict(id=ann_id, name=ann.label))
 
             # create the annotation entry
-            if ann.type == models.AnnotationType.OBJECT_DETECTION:
+            if ann.type is models.AnnotationType.OBJECT_DETECTION:
 
                 # convert bounding boxes to COCO format
                 img, img_id = image_map[str(ann.fileId)]
@@ -308,7 +305,9 @@ class _YOLOExporter(_ExportStrategy):
             A mapping from FileID (as str) to its subdirectory.
         """
 
-        files = self.file_man.get_files_by_project(project.projectId)
+        files = self.file_man.get_files_by_project(
+            project.projectId, data_type=models.DataType.IMAGE
+        )
 
         # shuffle files so sampling is random
         random.shuffle(files)
@@ -323,18 +322,11 @@ class _YOLOExporter(_ExportStrategy):
         for subdir, file_subset in chunks:
             for file in file_subset:
                 id_str = str(file.fileId)
-                if file.type != models.DataType.IMAGE:
-                    logger.warning(
-                        f"Skipping file {id_str} in {self.export_format.value} export because it is not an image!"
-                    )
-                    continue
-
                 image_map[id_str] = subdir
                 file_name = f"{id_str}{Path(file.filename).suffix}"
 
-                data, _ = self.file_man.download_file(file.fileId)
-
-                zip_file.writestr(f"images/{subdir}/{file_name}", data.getvalue())
+                with zip_file.open(f"images/{subdir}/{file_name}", "w") as entry:
+                    self.fs.download_to_stream(file.fileId, entry)
 
         return image_map
 
@@ -364,7 +356,7 @@ class _YOLOExporter(_ExportStrategy):
                 ann_id += 1
 
             # create the annotation entry
-            if ann.type == models.AnnotationType.OBJECT_DETECTION:
+            if ann.type is models.AnnotationType.OBJECT_DETECTION:
 
                 # our annotations are stored in the format YOLO likes, so just convert to str
                 bbox = ann.bbox
@@ -465,14 +457,19 @@ class _ClassificationExporter(_ExportStrategy):
         annotations = self.ann_man.get_annotations_by_project(project.projectId)
 
         for ann in annotations:
-            if not ann.type == models.AnnotationType.CLASSIFICATION:
+            if ann.type is not models.AnnotationType.CLASSIFICATION:
                 continue
 
-            data, file = self.file_man.download_file(ann.fileId)
+            file = self.file_man.get_file_by_id(ann.fileId)
 
-            zip_file.writestr(
-                f"data/{ann.label.strip()}/{file.filename}", data.getvalue()
-            )
+            if file is None:
+                logger.warning(f"File {ann.fileId} not found; skipping...")
+                continue
+
+            with zip_file.open(
+                f"data/{ann.label.strip()}/{file.filename}", "w"
+            ) as entry:
+                self.fs.download_to_stream(ann.fileId, entry)
 
 
 class ExportManager:
@@ -1,17 +1,33 @@
+import datetime
 from io import BytesIO
-from typing import Any, BinaryIO
+from typing import Any, BinaryIO, TypeVar, overload
 
 import gridfs
 import gridfs.errors
 from bson.objectid import ObjectId
 from PIL import Image
+from pydantic import TypeAdapter
 from pymongo.client_session import ClientSession
 
 from .. import exceptions as exc
 from .. import models
+from ..config import CONFIG
 from . import _utils
 from .db_manager import MongoDBManager
 
+_FILE_META_LIST = TypeAdapter(list[models.FileMeta])
+
+_StreamT = TypeVar("_StreamT", bound=BinaryIO)
+
+# uploads are written with bulk inserts, flushed whenever this many bytes of chunks are
+# pending so a large batch is never held in memory twice
+_UPLOAD_FLUSH_BYTES = 16 * 1024 * 1024
+
+# projects can hold thousands of files, so fetch listings in larger batches than the
+# default of 101 and only transfer the fields needed to build the metadata models
+_LISTING_BATCH_SIZE = 1000
+_LISTING_PROJECTION = {"filename": 1, "metadata": 1}
+
 
 class FileManager:
     """Annotation management for OpenLabel"""
@@ -20,7 +36,13 @@ class FileManager:
         """Initialize with database manager"""
         self.db = db_manager.db
         self.client = db_manager.client
-        self.fs = gridfs.GridFSBucket(self.db, "files")
+        self.chunk_size_bytes = CONFIG.gridfs_chunk_size
+
+        # pymongo 4 no longer computes an MD5 for GridFS uploads (disable_md5 was removed
+        # along with it), and the bulk upload path below writes chunks without hashing
+        self.fs = gridfs.GridFSBucket(
+            self.db, "files", chunk_size_bytes=self.chunk_size_bytes
+        )
 
     def upload_file(
         self,
@@ -46,18 +68,73 @@ class FileManager:
         Raises:
             exc.InvalidFileFormat: If the `content_type` is not supported.
             exc.InvalidFileFormat: If corrupted/malformatted file is provided.
+            exc.ResourceNotFound: If the project or creating user does not exist.
 
         Returns:
             The resultant metadata for the uploaded file.
         """
+        _utils.project_exists(self.db, project_id, True, session=session)
+        _utils.user_exists(self.db, creator_id, True, session=session)
+
+        return self._upload_file_unchecked(
+            file,
+            project_id,
+            creator_id,
+            filename,
+            content_type,
+            status=status,
+            session=session,
+        )
+
+    def _upload_file_unchecked(
+        self,
+        file: BinaryIO,
+        project_id: ObjectId,
+        creator_id: ObjectId,
+        filename: str,
+        content_type: str,
+        status: models.FileStatus = models.FileStatus.UNANNOTATED,
+        session: ClientSession | None = None,
+    ) -> models.FileMeta:
+        """Implementation of `upload_file`. Does not verify that the project and creator exist;
+        callers are expected to have done so already.
+        """
+        meta = self._prepare_file(file, project_id, creator_id, content_type, status)
+        (file_id,) = self._write_gridfs_files([(file, filename, meta)], session=session)
+
+        return models.get_filemeta_model(content_type)(
+            **meta, fileId=file_id, filename=filename
+        )
+
+    def _prepare_file(
+        self,
+        file: BinaryIO,
+        project_id: ObjectId,
+        creator_id: ObjectId,
+        content_type: str,
+        status: models.FileStatus = models.FileStatus.UNANNOTATED,
+    ) -> dict[str, Any]:
+        """Collects the metadata for a file about to be uploaded.
+
+        Args:
+            file: The file to upload.
+            project_id: The ID of the project the file belongs to.
+            creator_id: The ID of the user that uploaded the file.
+            content_type: The MIME type of the file.
+            status: The status of the file. Defaults to models.FileStatus.UNANNOTATED.
+
+        Raises:
+            exc.InvalidFileFormat: If the `content_type` is not supported.
+            exc.InvalidFileFormat: If corrupted/malformatted file is provided.
+
+        Returns:
+            The file metadata. `file` is rewound so it is ready to be read for upload.
+        """
         try:
             file_type = models.DataType.from_mime(content_type)
         except ValueError as e:
             raise exc.InvalidFileFormat(str(e))
 
-        _utils.project_exists(self.db, project_id, True, session=session)
-        _utils.user_exists(self.db, creator_id, True, session=session)
-
         # get file size
         file.seek(0, 2)
         filesize = file.tell()
@@ -74,7 +151,7 @@ class FileManager:
         )
 
         # Collect
-        if file_type == models.DataType.IMAGE:
+        if file_type is models.DataType.IMAGE:
             try:
                 image = Image.open(file)
                 width, height = image.size
@@ -82,37 +159,128 @@ class FileManager:
                 meta["height"] = height
             except Exception:
                 raise exc.InvalidFileFormat("Could not process image")
-        elif file_type == models.DataType.VIDEO:
+        elif file_type is models.DataType.VIDEO:
             # TODO: video support
             raise NotImplementedError("Videos have not been implemented yet.")
 
-        # upload the file
         file.seek(0)  # Ensure reading from beginning
-        with self.fs.open_upload_stream(filename, metadata=meta) as grid_in:
-            grid_in.write(file.read())
-            file_id = grid_in._id
+        return meta
 
-        return models.get_filemeta_model(content_type)(
-            **meta, fileId=file_id, filename=filename
-        )
+    def _write_gridfs_files(
+        self,
+        uploads: list[tuple[BinaryIO, str, dict[str, Any]]],
+        session: ClientSession | None = None,
+    ) -> list[ObjectId]:
+        """Writes files to the GridFS bucket with bulk inserts, rather than the one insert
+        per chunk issued by `GridIn`. Files are read one chunk at a time and the pending
+        documents are flushed every `_UPLOAD_FLUSH_BYTES`, so at most that much chunk data
+        is buffered at once.
+
+        Args:
+            uploads: (file, filename, metadata) triples to write. Each file must be
+                positioned at the start of its contents.
+            session: The pymongo ClientSession to use. Defaults to None.
+
+        Returns:
+            The IDs of the written files, in the same order as `uploads`.
+        """
+        chunk_size = self.chunk_size_bytes
+
+        file_ids: list[ObjectId] = []
+        files_docs: list[dict[str, Any]] = []
+        chunks: list[dict[str, Any]] = []
+        pending = 0
+
+        for file, filename, metadata in uploads:
+            file_id = ObjectId()
+            length = 0
+
+            for n, data in enumerate(iter(lambda: file.read(chunk_size), b"")):
+                chunks.append({"files_id": file_id, "n": n, "data": data})
+                length += len(data)
+                pending += len(data)
+
+                if pending >= _UPLOAD_FLUSH_BYTES:
+                    self._insert_gridfs_docs(files_docs, chunks, session=session)
+                    files_docs, chunks, pending = [], [], 0
+
+            file_ids.append(file_id)
+            files_docs.append(
+                {
+                    "_id": file_id,
+                    "length": length,
+                    "chunkSize": chunk_size,
+                    "uploadDate": datetime.datetime.now(datetime.timezone.utc),
+                    "filename": filename,
+                    "metadata": metadata,
+                }
+            )
+
+        self._insert_gridfs_docs(files_docs, chunks, session=session)
+
+        return file_ids
+
+    def _insert_gridfs_docs(
+        self,
+        files_docs: list[dict[str, Any]],
+        chunks: list[dict[str, Any]],
+        session: ClientSession | None = None,
+    ):
+        """Bulk inserts prepared GridFS documents. Chunks are written before their `files`
+        documents so partially-written files are never visible.
+
+        Args:
+            files_docs: The `files` documents to insert.
+            chunks: The `chunks` documents to insert.
+            session: The pymongo ClientSession to use. Defaults to None.
+        """
+        if chunks:
+            self.db["files.chunks"].insert_many(chunks, ordered=False, session=session)
+        if files_docs:
+            self.db["files.files"].insert_many(
+                files_docs, ordered=False, session=session
+            )
 
     def _upload_files(
         self, files: list[dict[str, Any]], session: ClientSession | None
     ) -> list[models.FileMeta]:
         """Implementation of `upload_files`."""
-        metas: list[models.FileMeta] = []
+
+        # validate every project/creator at once rather than once per file
+        _utils.projects_and_users_exist(
+            self.db,
+            ((file["project_id"], file["creator_id"]) for file in files),
+            session=session,
+        )
+
+        # collect (and validate) every file's metadata before anything is written
+        uploads = [
+            (
+                file["file"],
+                file["filename"],
+                self._prepare_file(
+                    file["file"],
+                    file["project_id"],
+                    file["creator_id"],
+                    file["content_type"],
+                    file.get("status", models.FileStatus.UNANNOTATED),
+                ),
+            )
+            for file in files
+        ]
 
         if session:
             with session.start_transaction():
-                for file in files:
-                    meta = self.upload_file(**file, session=session)
-                    metas.append(meta)
+                file_ids = self._write_gridfs_files(uploads, session=session)
         else:
-            for file in files:
-                meta = self.upload_file(**file, session=None)
-                metas.append(meta)
+            file_ids = self._write_gridfs_files(uploads)
 
-        return metas
+        return [
+            models.get_filemeta_model(meta["contentType"])(
+                **meta, fileId=file_id, filename=filename
+            )
+            for (_, filename, meta), file_id in zip(uploads, file_ids)
+        ]
 
     def upload_files(
         self, files: list[dict[str, Any]], session: ClientSession | None = None
@@ -128,35 +296,62 @@ class FileManager:
         """
         return self._upload_files(files, session)
 
+    @overload
+    def download_file(
+        self, file_id: ObjectId, out_stream: None = None
+    ) -> tuple[BytesIO, models.FileMeta] | None: ...
 
+    @overload
     def download_file(
-        self, file_id: ObjectId
-    ) -> tuple[BytesIO, models.FileMeta] | None:
+        self, file_id: ObjectId, out_stream: _StreamT
+    ) -> tuple[_StreamT, models.FileMeta] | None: ...
+
+    def download_file(
+        self, file_id: ObjectId, out_stream: BinaryIO | None = None
+    ) -> tuple[BinaryIO, models.FileMeta] | None:
         """Downloads a file.
 
         Args:
             file_id: The ID of the file to download.
+            out_stream: A writable stream to download the file into (e.g., an open ZIP entry).
+                If None, a new BytesIO buffer is created. Defaults to None.
 
         Returns:
-            A pair containing (file data, file metadata), or None if the file does not exist.
+            A pair containing (the stream written to, file metadata), or None if the file does not exist.
         """
 
-        details: gridfs.GridOut | None = None
-        for thing in self.fs.find({"_id": file_id}).limit(-1):
-            details = thing
+        meta = self.get_file_by_id(file_id)
 
-        if details is None:
+        if meta is None:
             return None
 
-        buffer = BytesIO()
-        self.fs.download_to_stream(file_id, buffer)
+        if out_stream is None:
+            out_stream = BytesIO()
 
-        return (
-            buffer,
-            models.get_filemeta_model(details.metadata["contentType"]).from_grid_out(
-                details
-            ),
-        )
+        self.fs.download_to_stream(file_id, out_stream)
+
+        return out_stream, meta
+
+    def open_file_stream(
+        self, file_id: ObjectId
+    ) -> tuple[gridfs.GridOut, models.FileMeta] | None:
+        """Opens a file for streaming instead of buffering the whole file in memory.
+
+        Args:
+            file_id: The ID of the file to open.
+
+        Returns:
+            A pair containing (a readable stream of the file's contents, file metadata), or None
+            if the file does not exist. Use `GridOut.readchunk` to read the stream one GridFS
+            chunk at a time; iterating it directly yields lines.
+        """
+        try:
+            grid_out = self.fs.open_download_stream(file_id)
+        except gridfs.errors.NoFile:
+            return None
+
+        content_type = grid_out.metadata["contentType"]
+        return grid_out, models.get_filemeta_model(content_type).from_grid_out(grid_out)
 
     def get_file_by_id(
         self, file_id: ObjectId, session: ClientSession | None = None
@@ -168,34 +363,49 @@ class FileManager:
             session: The pymongo ClientSession to use. Only applies to non-file system related queries
                 since GridFS does not support sessions.Defaults to None.
         """
-        for details in self.fs.find({"_id": file_id}, session=session).limit(-1):
-            content_type = details.metadata["contentType"]
-            return models.get_filemeta_model(content_type).from_grid_out(details)
-        return None
+        doc = self.db["files.files"].find_one({"_id": file_id}, session=session)
+
+        if doc is None:
+            return None
+
+        content_type = doc["metadata"]["contentType"]
+        return models.get_filemeta_model(content_type)(
+            **doc["metadata"], fileId=doc["_id"], filename=doc["filename"]
+        )
 
     def get_files_by_project(
-        self, project_id: ObjectId, limit: int = 0, session: ClientSession | None = None
+        self,
+        project_id: ObjectId,
+        limit: int = 0,
+        data_type: models.DataType | None = None,
+        session: ClientSession | None = None,
     ) -> list[models.FileMeta]:
         """Returns a list of FileMeta associated with a project.
 
         Args:
             project_id: The ID of the project for which to fetch file metadata.
             limit: The maximum number of metadatas to return. Defaults to 0.
+            data_type: If provided, only files of this data type are returned. Defaults to None.
             session: The pymongo ClientSession to use. Only applies to non-file system related queries
                 since GridFS does not support sessions.Defaults to None.
         """
 
         _utils.project_exists(self.db, project_id, True, session=session)
 
-        metas: list[dict[str, Any]] = []
-
-        for details in self.fs.find({"metadata.projectId": project_id}).limit(limit):
+        query: dict[str, Any] = {"metadata.projectId": project_id}
+        if data_type is not None:
+            query["metadata.type"] = data_type.value
 
-            content_type = details.metadata["contentType"]
-            meta = models.get_filemeta_model(content_type).from_grid_out(details)
-            metas.append(meta)
+        metas = [
+            {**doc["metadata"], "fileId": doc["_id"], "filename": doc["filename"]}
+            for doc in self.db["files.files"]
+            .find(query, _LISTING_PROJECTION, session=session)
+            .batch_size(_LISTING_BATCH_SIZE)
+            .limit(limit)
+        ]
 
-        return metas
+        # validate the whole list in one pass, dispatching on the "type" discriminator
+        return _FILE_META_LIST.validate_python(metas)
 
     def delete_file(self, file_id: ObjectId, session: ClientSession | None = None):
         """Deletes the specified file.
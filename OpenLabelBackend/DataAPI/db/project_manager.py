@@ -1,11 +1,22 @@
 import datetime
+from typing import Any
 
 from bson.objectid import ObjectId
+from pydantic import TypeAdapter, ValidationError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from .. import exceptions as exc
 from .. import models
+from . import _utils
 from .db_manager import MongoDBManager
 
+_DUPLICATE_KEY_ERROR = 11000
+
+_PROJECT_LIST = TypeAdapter(list[models.Project])
+
+# keys accepted by update_project
+_PROJECT_PATCH_KEYS = frozenset({"name", "description", "settings"})
+
 
 class ProjectManager:
     """Project management for OpenLabel"""
@@ -42,21 +53,79 @@ class ProjectManager:
         Returns:
             The ID of the created project.
         """
-        # Check if project name already exists for this user
-        existing = self.db.projects.find_one({"name": name, "createdBy": created_by})
+        project_doc = self._build_project_doc(
+            name=name,
+            description=description,
+            data_type=data_type,
+            annotation_type=annotation_type,
+            created_by=created_by,
+            labels=labels,
+            is_public=is_public,
+        )
 
-        if existing:
+        # name uniqueness is enforced by the unique (createdBy, name) index
+        try:
+            result = self.db.projects.insert_one(project_doc)
+        except DuplicateKeyError:
             raise exc.ProjectNameExists(
                 f"Project '{name}' already exists for this user"
             )
 
-        project_doc = models.BaseProject(
+        return result.inserted_id
+
+    def create_projects(self, projects: list[dict[str, Any]]) -> list[ObjectId]:
+        """Creates multiple projects with a single insert.
+
+        Args:
+            projects: A list of dictionaries with keys and values compatible with the `create_project` method.
+
+        Raises:
+            exc.ProjectNameExists: If any of the project names are already being used by their creating user.
+                All other projects are still created.
+
+        Returns:
+            The IDs of the created projects, in the same order as `projects`.
+        """
+        project_docs = [self._build_project_doc(**project) for project in projects]
+
+        try:
+            result = self.db.projects.insert_many(project_docs, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details["writeErrors"]
+            if any(error["code"] != _DUPLICATE_KEY_ERROR for error in errors):
+                raise
+
+            names = ", ".join(project_docs[error["index"]]["name"] for error in errors)
+            raise exc.ProjectNameExists(
+                f"Projects '{names}' already exist for their creating users"
+            )
+
+        return result.inserted_ids
+
+    def _build_project_doc(
+        self,
+        name: str,
+        description: str,
+        data_type: models.DataType,
+        annotation_type: models.AnnotationType,
+        created_by: ObjectId,
+        labels: list[str],
+        is_public: bool = False,
+    ) -> dict[str, Any]:
+        """Builds the database document for a new project. See `create_project` for argument details."""
+        # one timestamp so creation, update, and join times match exactly
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        return models.BaseProject(
             name=name,
             description=description,
             createdBy=created_by,
+            createdAt=now,
+            updatedAt=now,
             members=[
                 models.ProjectMember(
                     userId=created_by,
+                    joinedAt=now,
                     roleId=self.man.get_role_by_name(models.RoleName.ADMIN).roleId,
                 ),
             ],
@@ -66,10 +135,7 @@ class ProjectManager:
                 isPublic=is_public,
                 labels=labels,
             ),
-        )
-
-        result = self.db.projects.insert_one(project_doc.model_dump())
-        return result.inserted_id
+        ).model_dump()
 
     def get_project_by_id(self, project_id: ObjectId) -> models.Project | None:
         """Returns the specified project, or None if the project doesn't exist.
@@ -83,14 +149,22 @@ class ProjectManager:
 
         return models.Project.model_validate(project)
 
-    def get_projects_by_user(self, user_id: ObjectId) -> list[models.Project]:
+    def get_projects_by_user(
+        self, user_id: ObjectId, owner: bool | None = None
+    ) -> list[models.Project]:
         """Fetches all project in which the specified user is a member.
 
         Args:
             user_id: The ID of the user in question.
+            owner: Whether to only return projects the user created (True), projects they
+                didn't create (False), or all projects (None). Defaults to None.
         """
-        projects = self.db.projects.find({"members.userId": user_id})
-        return [models.Project.model_validate(project) for project in projects]
+        query: dict[str, Any] = {"members.userId": user_id}
+        if owner is not None:
+            query["createdBy"] = user_id if owner else {"$ne": user_id}
+
+        projects = self.db.projects.find(query)
+        return _PROJECT_LIST.validate_python(list(projects))
 
     def update_project(
         self, project_id: ObjectId, update_data: dict, user_id: ObjectId
@@ -111,13 +185,7 @@ class ProjectManager:
         Returns:
             True if something was modified, False otherwise.
         """
-        project = self.get_project_by_id(project_id)
-
-        if not project:
-            raise exc.ResourceNotFound("Project not found")
-
-        valid_keys = {"name", "description", "settings"}
-        invalid_keys = set(update_data.keys()) - valid_keys
+        invalid_keys = update_data.keys() - _PROJECT_PATCH_KEYS
         if invalid_keys:
             raise exc.InvalidPatchMap(
                 f"Keys {''.join(invalid_keys)} are not valid keys for updating projects!"
@@ -141,34 +209,34 @@ class ProjectManager:
         #         "User does not have permission to update this project"
         #     )
 
-        # Update settings if provided
+        # Update settings if provided; dotted paths let MongoDB merge them into the
+        # existing settings instead of replacing the whole subdocument
         if "settings" in update_data:
-            update_data["settings"] = {
-                **project.settings.model_dump(),
-                **update_data["settings"],
-            }
-
-            # ensure validity of changes
-            models.ProjectSettings.model_validate(update_data["settings"])
-
-        # Don't allow updating name to an existing name
-        if "name" in update_data:
-            existing = self.db.projects.find_one(
-                {
-                    "name": update_data["name"],
-                    "createdBy": project.createdBy,
-                    "_id": {"$ne": project_id},
-                }
-            )
-            if existing:
-                raise exc.ProjectNameExists(
-                    f"Project name '{update_data['name']}' already exists"
-                )
+            try:
+                settings = models.UpdateProjectSettings.model_validate(
+                    update_data.pop("settings")
+                ).model_dump(exclude_unset=True)
+            except ValidationError as e:
+                raise exc.InvalidPatchMap(f"Invalid project settings: {e}")
+
+            for key, value in settings.items():
+                update_data[f"settings.{key}"] = value
 
         # Always update the updatedAt field
         update_data["updatedAt"] = datetime.datetime.now(datetime.timezone.utc)
 
-        result = self.db.projects.update_one({"_id": project_id}, {"$set": update_data})
+        # the unique (createdBy, name) index rejects renames to an existing name
+        try:
+            result = self.db.projects.update_one(
+                {"_id": project_id}, {"$set": update_data}
+            )
+        except DuplicateKeyError:
+            raise exc.ProjectNameExists(
+                f"Project name '{update_data['name']}' already exists"
+            )
+
+        if result.matched_count == 0:
+            raise exc.ResourceNotFound("Project not found")
 
         return result.modified_count > 0
 
@@ -194,13 +262,8 @@ class ProjectManager:
             RoleNotFound: If the specified role does not exist.
 
         Returns:
-            _description_
+            True if the member was added, False otherwise.
         """
-        project = self.get_project_by_id(project_id)
-
-        if not project:
-            raise exc.ResourceNotFound("Project not found")
-
         # Check if the adding user has permission
         # TODO: revamp permissions
         # has_permission = False
@@ -217,19 +280,14 @@ class ProjectManager:
         # if not has_permission:
         #     raise exc.PermissionError("User does not have permission to add members")
 
-        # Check if user already a member
-        for member in project["members"]:
-            if member["userId"] == user_id:
-                raise exc.UserAlreadyExists("User is already a member of this project")
-
         # Get role ID
         role = self.man.get_role_by_name(role_name)
         if not role:
             raise exc.RoleNotFound(f"Role '{role_name}' does not exist")
 
-        # Add user to project
+        # Add user to project; the filter skips the push if they are already a member
         result = self.db.projects.update_one(
-            {"_id": project_id},
+            {"_id": project_id, "members.userId": {"$ne": user_id}},
             {
                 "$push": {
                     "members": {
@@ -241,6 +299,12 @@ class ProjectManager:
             },
         )
 
+        if result.matched_count == 0:
+            # distinguish between a missing project and an existing member
+            if not _utils.project_exists(self.db, project_id):
+                raise exc.ResourceNotFound("Project not found")
+            raise exc.UserAlreadyExists("User is already a member of this project")
+
         return result.modified_count > 0
 
     def get_project_members(
@@ -254,28 +318,52 @@ class ProjectManager:
         Raises:
             exc.ResourceNotFound: If the specified project does not exist.
         """
-        project = self.get_project_by_id(project_id)
+        # join users and roles server-side rather than querying them per member
+        members = list(
+            self.db.projects.aggregate(
+                [
+                    {"$match": {"_id": project_id}},
+                    {"$unwind": "$members"},
+                    {
+                        "$lookup": {
+                            "from": "users",
+                            "localField": "members.userId",
+                            "foreignField": "_id",
+                            "as": "user",
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "roles",
+                            "localField": "members.roleId",
+                            "foreignField": "_id",
+                            "as": "role",
+                        }
+                    },
+                    # members whose user or role no longer exists are dropped
+                    {"$unwind": "$user"},
+                    {"$unwind": "$role"},
+                    # keep password hashes on the server
+                    {"$unset": "user.password"},
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "joinedAt": "$members.joinedAt",
+                            "user": 1,
+                            "role": 1,
+                        }
+                    },
+                ]
+            )
+        )
 
-        if not project:
+        # an empty result may also mean the project has no members
+        if not members and not _utils.project_exists(self.db, project_id):
             raise exc.ResourceNotFound("Project not found")
 
-        members: list[models.ProjectMemberDetails] = []
-        for member in project.members:
-            user = self.db.users.find_one({"_id": member.userId})
-            role = self.db.roles.find_one({"_id": member.roleId})
-
-            if user and role:
-                members.append(
-                    models.ProjectMemberDetails(
-                        joinedAt=member.joinedAt,
-                        user=models.UserNoPasswordWithID.model_validate(user),
-                        role=models.Role.model_validate(role),
-                    )
-                )
-
-        return members
+        return [models.ProjectMemberDetails.model_validate(m) for m in members]
 
     def get_all_projects(self) -> list[models.Project]:
         """Returns all projects."""
         projects = self.db.projects.find()
-        return [models.Project.model_validate(project) for project in projects]
+        return _PROJECT_LIST.validate_python(list(projects))
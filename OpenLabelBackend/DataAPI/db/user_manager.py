@@ -3,8 +3,11 @@ from typing import Any, Mapping
 
 import bcrypt
 from bson.objectid import ObjectId
+from pydantic import TypeAdapter
+from pymongo.errors import DuplicateKeyError
 
 from .. import auth_utils, models
+from ..config import CONFIG
 from ..exceptions import (
     EmailAlreadyExists,
     InvalidPatchMap,
@@ -14,6 +17,32 @@ from ..exceptions import (
 )
 from .db_manager import MongoDBManager
 
+# keys accepted by update_user; role_name is translated into a roleId
+_USER_PATCH_KEYS = frozenset(models.User.model_fields) | {"role_name"}
+
+_USER_LIST = TypeAdapter(list[models.UserNoPasswordWithID])
+
+# preference sections that can be patched, with their models and known keys
+_PREFERENCE_MODELS = {
+    "keyboardShortcuts": (
+        models.KeyboardShortcuts,
+        frozenset(models.KeyboardShortcuts.model_fields),
+    ),
+    "uiPreferences": (
+        models.UIPreferences,
+        frozenset(models.UIPreferences.model_fields),
+    ),
+}
+
+# logins within this long of the stored lastLogin don't update it
+_LAST_LOGIN_RESOLUTION = datetime.timedelta(minutes=5)
+
+# defaults are constant, so they are dumped once rather than rebuilt for every new user
+_DEFAULT_PREFERENCES = {
+    "keyboardShortcuts": models.KeyboardShortcuts().model_dump(),
+    "uiPreferences": models.UIPreferences().model_dump(),
+}
+
 
 class UserManager:
     """User management for OpenLabel"""
@@ -21,6 +50,13 @@ class UserManager:
     def __init__(self, db_manager: MongoDBManager):
         """Initialize with database manager"""
         self.db = db_manager.db
+        self.man = db_manager
+
+        # checked against when a login names an unknown user, so that the response takes
+        # as long as a wrong password would and doesn't reveal which usernames exist
+        self._dummy_hash = bcrypt.hashpw(
+            b"dummy-password", bcrypt.gensalt(rounds=CONFIG.bcrypt_rounds)
+        )
 
     def _get_role_id_by_name(self, role_name: str) -> ObjectId | None:
         """Returns the ID of the role with name `role_name` if it exists, else `None`
@@ -28,12 +64,35 @@ class UserManager:
         Args:
             role_name: The name of the role for which to fetch the ID.
         """
-        # TODO: replace with new role tech when its created
-        role = self.db.roles.find_one({"name": role_name})
+        role = self.man.get_role_by_name(role_name)
         if not role:
             return None
 
-        return role["_id"]
+        return role.roleId
+
+    @staticmethod
+    def _raise_duplicate(
+        error: DuplicateKeyError, username: str | None, email: str | None
+    ):
+        """Translates a DuplicateKeyError from the unique username/email indexes into the
+        matching OpenLabel error.
+
+        Args:
+            error: The error raised by the insert or update.
+            username: The username that was written, if any.
+            email: The email that was written, if any.
+
+        Raises:
+            UserAlreadyExists: If the username index was violated.
+            EmailAlreadyExists: If the email index was violated.
+            DuplicateKeyError: If any other unique index was violated.
+        """
+        key_pattern = (error.details or {}).get("keyPattern", {})
+        if "username" in key_pattern:
+            raise UserAlreadyExists(f"Username '{username}' already exists") from error
+        if "email" in key_pattern:
+            raise EmailAlreadyExists(f"Email '{email}' already exists") from error
+        raise error
 
     def create_user(
         self,
@@ -62,20 +121,14 @@ class UserManager:
         Returns:
             An auth token equivalent to if the user logged in.
         """
-        # TODO: consider making custom errors for better communication with routes
-        # Check if username or email already exists
-        if self.db.users.find_one({"username": username}):
-            raise UserAlreadyExists(f"Username '{username}' already exists")
-
-        if self.db.users.find_one({"email": email}):
-            raise EmailAlreadyExists(f"Email '{email}' already exists")
-
         role_id = self._get_role_id_by_name(role_name)
         if role_id is None:
             raise RoleNotFound(f"Role '{role_name}' does not exist")
 
         # Hash the password
-        hashed_pw = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+        hashed_pw = bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt(rounds=CONFIG.bcrypt_rounds)
+        )
 
         user = models.User(
             username=username,
@@ -88,24 +141,29 @@ class UserManager:
             lastLogin=datetime.datetime.now(datetime.timezone.utc),
         )
 
-        result = self.db.users.insert_one(user.model_dump())
+        # username and email uniqueness is enforced by unique indexes
+        try:
+            result = self.db.users.insert_one(user.model_dump())
+        except DuplicateKeyError as e:
+            self._raise_duplicate(e, username, email)
 
         self.create_default_preferences(result.inserted_id)
 
         # we don't need to check password, so just generate auth token immediately
-        return auth_utils.generate_token(str(result.inserted_id))
+        return auth_utils.generate_token(result.inserted_id)
 
     def login(self, username: str, password: str) -> str | None:
         """Authenticates the user and returns an auth token if successful."""
         user = self.db.users.find_one({"username": username})
         if not user:
+            bcrypt.checkpw(password.encode("utf-8"), self._dummy_hash)
             return None
 
         if bcrypt.checkpw(password.encode("utf-8"), user["password"]):
-            self.db.users.update_one(
-                {"_id": user["_id"]},
-                {"$set": {"lastLogin": datetime.datetime.now(datetime.timezone.utc)}},
-            )
+            if self._last_login_stale(user.get("lastLogin")):
+                self.db.users.update_one(
+                    {"_id": user["_id"]}, {"$currentDate": {"lastLogin": True}}
+                )
             token = auth_utils.generate_token(user["_id"])
 
             return token
@@ -116,6 +174,24 @@ class UserManager:
             # }
         return None
 
+    @staticmethod
+    def _last_login_stale(last_login: datetime.datetime | None) -> bool:
+        """Returns True if a login at `last_login` is old enough that it should be
+        overwritten, so that bursts of logins don't each cost a write.
+
+        Args:
+            last_login: The stored lastLogin of the user, or None if there is none.
+        """
+        if last_login is None:
+            return True
+
+        # pymongo returns naive datetimes that are in UTC
+        if last_login.tzinfo is None:
+            last_login = last_login.replace(tzinfo=datetime.timezone.utc)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return now - last_login >= _LAST_LOGIN_RESOLUTION
+
     def get_user_by_id(self, user_id: ObjectId) -> dict | None:
         """Returns a single user object matching the provided ID, or `None` if the user does not exist
 
@@ -124,6 +200,24 @@ class UserManager:
         """
         return self.db.users.find_one({"_id": user_id})
 
+    def get_user_model_by_id(
+        self, user_id: ObjectId
+    ) -> models.UserNoPasswordWithID | None:
+        """Returns the user matching the provided ID as a model, without their password, or
+        `None` if the user does not exist.
+
+        The model is built with `model_construct`, skipping validation, since the document
+        comes straight from the database. Don't use this for data from any other source.
+
+        Args:
+            user_id: The user ID of the user to fetch.
+        """
+        user = self.db.users.find_one({"_id": user_id}, {"password": 0})
+        if user is None:
+            return None
+
+        return models.UserNoPasswordWithID.model_construct(**user)
+
     def get_user_by_username(self, username: str) -> dict | None:
         """Returns a single user object matching the provided username, or `None` if the user does not exist
 
@@ -132,13 +226,18 @@ class UserManager:
         """
         return self.db.users.find_one({"username": username})
 
-    def get_users(self, limit: int = 100) -> list[dict]:
-        """Returns a list of users matching the provided search criteria.
+    def get_users(
+        self, limit: int = 100, skip: int = 0
+    ) -> list[models.UserNoPasswordWithID]:
+        """Returns a list of users matching the provided search criteria. Password hashes
+        are not included.
 
         Args:
             limit: The maximum number of users to return. Defaults to 100.
+            skip: The number of users to skip, for paging through results. Defaults to 0.
         """
-        return list(self.db.users.find().limit(limit))
+        users = self.db.users.find({}, {"password": 0}).sort("_id").skip(skip)
+        return _USER_LIST.validate_python(list(users.limit(limit)))
 
     def update_user(self, user_id: ObjectId, update_data: Mapping[str, Any]) -> bool:
         """Updates a user based on the provided update_data. Updates are partial,
@@ -160,35 +259,15 @@ class UserManager:
             True if the user was updated, else False.
         """
 
-        invalid_keys = set(update_data.keys()) - (
-            set(models.User.model_fields.keys()) | {"role_name"}
-        )
+        invalid_keys = update_data.keys() - _USER_PATCH_KEYS
         if invalid_keys:
             raise InvalidPatchMap(f"Invalid user keys: {', '.join(invalid_keys)}")
 
-        # Don't allow updating username or email to existing values
-        if "username" in update_data:
-            existing = self.db.users.find_one(
-                {"username": update_data["username"], "_id": {"$ne": user_id}}
-            )
-            if existing:
-                raise UserAlreadyExists(
-                    f"Username '{update_data['username']}' already exists"
-                )
-
-        if "email" in update_data:
-            existing = self.db.users.find_one(
-                {"email": update_data["email"], "_id": {"$ne": user_id}}
-            )
-            if existing:
-                raise EmailAlreadyExists(
-                    f"Email '{update_data['email']}' already exists"
-                )
-
         # Hash password if it's being updated
         if "password" in update_data:
             update_data["password"] = bcrypt.hashpw(
-                update_data["password"].encode("utf-8"), bcrypt.gensalt()
+                update_data["password"].encode("utf-8"),
+                bcrypt.gensalt(rounds=CONFIG.bcrypt_rounds),
             )
 
         # Update role if specified by name
@@ -201,7 +280,13 @@ class UserManager:
 
             update_data["roleId"] = role_id
 
-        result = self.db.users.update_one({"_id": user_id}, {"$set": update_data})
+        # the unique indexes reject changing username or email to existing values
+        try:
+            result = self.db.users.update_one({"_id": user_id}, {"$set": update_data})
+        except DuplicateKeyError as e:
+            self._raise_duplicate(
+                e, update_data.get("username"), update_data.get("email")
+            )
 
         return result.modified_count > 0
 
@@ -214,14 +299,10 @@ class UserManager:
         Returns:
             The ID of the created preferences.
         """
-        preferences = models.UserPreferences(
-            userId=user_id,
-            keyboardShortcuts=models.KeyboardShortcuts(),
-            uiPreferences=models.UIPreferences(),
-        )
-        preferences = dict(preferences)
-        for key in ("keyboardShortcuts", "uiPreferences"):
-            preferences[key] = dict(preferences[key])
+        preferences = {
+            "userId": user_id,
+            **{key: dict(value) for key, value in _DEFAULT_PREFERENCES.items()},
+        }
 
         result = self.db.userPreferences.insert_one(preferences)
         return result.inserted_id
@@ -245,30 +326,41 @@ class UserManager:
             preferences: The new preferences (partial update).
 
         Raises:
-            ValueError: If there are no preferences associated with `user_id`.
+            ResourceNotFound: If there are no preferences associated with `user_id`.
 
         Returns:
             True if the preferences were updated, else False.
         """
-        old: dict = self.db.userPreferences.find_one({"userId": user_id})
-
-        if not old:
-            raise ResourceNotFound(f"User {user_id} does not have preferences.")
+        # only the changed leaves are written, as dotted paths
+        update: dict[str, Any] = {}
 
         # ensure that no new, unexpected properties are added
-        for preference, model in (
-            ("keyboardShortcuts", models.KeyboardShortcuts),
-            ("uiPreferences", models.UIPreferences),
-        ):
+        for preference, (model, allowed_keys) in _PREFERENCE_MODELS.items():
             if preference not in preferences:
                 continue
 
-            for key, value in preferences[preference].items():
-                if key in model.model_fields.keys():
-                    old[preference][key] = value
+            changes = {
+                key: value
+                for key, value in preferences[preference].items()
+                if key in allowed_keys
+            }
 
             # error will be thrown if validation fails
-            model(**old[preference])
+            model(**changes)
+
+            for key, value in changes.items():
+                update[f"{preference}.{key}"] = value
+
+        if not update:
+            if not self.db.userPreferences.find_one({"userId": user_id}, {"_id": 1}):
+                raise ResourceNotFound(f"User {user_id} does not have preferences.")
+            return False
+
+        result = self.db.userPreferences.update_one(
+            {"userId": user_id}, {"$set": update}
+        )
+
+        if result.matched_count == 0:
+            raise ResourceNotFound(f"User {user_id} does not have preferences.")
 
-        result = self.db.userPreferences.update_one({"userId": user_id}, {"$set": old})
         return result.modified_count > 0
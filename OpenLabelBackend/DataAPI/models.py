@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import datetime
+import functools
+import re
 from enum import Enum
 from typing import Annotated, Any, Literal, Self
 
 import gridfs
 from bson.objectid import ObjectId
 from pydantic import (
+    AfterValidator,
     AliasChoices,
     BaseModel,
     ConfigDict,
-    EmailStr,
     Field,
     GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
     PlainSerializer,
     computed_field,
+    field_validator,
     model_validator,
 )
+from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import core_schema
 
 
@@ -45,13 +50,16 @@ class DataType(str, Enum):
 
     @classmethod
     def from_mime(cls, mime_type: str) -> DataType:
-        if mime_type.startswith("text"):
-            return cls.TEXT
-        elif mime_type.startswith("image"):
-            return cls.IMAGE
-        elif mime_type.startswith("video"):
-            return cls.VIDEO
-        raise ValueError(f"Cannot infer {cls.__name__} from MIME type '{mime_type}'")
+        try:
+            return _DATA_TYPES_BY_MIME[mime_type.split("/", 1)[0]]
+        except KeyError:
+            raise ValueError(
+                f"Cannot infer {cls.__name__} from MIME type '{mime_type}'"
+            ) from None
+
+
+# maps the top-level MIME type (e.g., "image" in "image/png") to its data type
+_DATA_TYPES_BY_MIME = {data_type.value: data_type for data_type in DataType}
 
 
 class ExportFormat(str, Enum):
@@ -73,10 +81,21 @@ class _ObjectID(ObjectId):
     def __get_pydantic_core_schema__(
         cls, source_type, handler: GetCoreSchemaHandler
     ) -> core_schema.CoreSchema:
-        return core_schema.no_info_after_validator_function(
-            cls.validate, core_schema.any_schema()
+        # ObjectIds (e.g., everything read from MongoDB) pass through the isinstance check
+        # in pydantic-core; only other values, like strings, call back into Python
+        return core_schema.union_schema(
+            [
+                core_schema.is_instance_schema(ObjectId),
+                core_schema.no_info_plain_validator_function(cls.validate),
+            ]
         )
 
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return {"type": "string"}
+
     @classmethod
     def validate(cls, value: Any):
         return cls(value)
@@ -84,25 +103,46 @@ class _ObjectID(ObjectId):
 
 ID = Annotated[
     _ObjectID,
-    PlainSerializer(lambda x: str(x), return_type=str, when_used="json"),
+    PlainSerializer(str, return_type=str, when_used="json"),
 ]
 
 
+_EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _validate_email(value: str) -> str:
+    if not _EMAIL_PATTERN.match(value):
+        raise ValueError(f"'{value}' is not a valid email address")
+    return value
+
+
+Email = Annotated[str, AfterValidator(_validate_email)]
+
+
 # SHARED PROPERTIES
 
-_now_field = Field(default_factory=lambda: datetime.datetime.now(datetime.timezone.utc))
+_UTC = datetime.timezone.utc
+
+
+# a partial calls datetime.now directly, without a Python-level wrapper frame
+_utcnow = functools.partial(datetime.datetime.now, _UTC)
+
+
+def _now_field():
+    """Returns a new field that defaults to the current UTC time."""
+    return Field(default_factory=_utcnow)
 
 
 class HasCreatedAt(BaseModel):
-    createdAt: datetime.datetime = _now_field
+    createdAt: datetime.datetime = _now_field()
 
 
 class HasUpdatedAt(BaseModel):
-    updatedAt: datetime.datetime = _now_field
+    updatedAt: datetime.datetime = _now_field()
 
 
 class HasJoinedAt(BaseModel):
-    joinedAt: datetime.datetime = _now_field
+    joinedAt: datetime.datetime = _now_field()
 
 
 class HasCreatedBy(BaseModel):
@@ -250,13 +290,19 @@ def get_annotation_model(annotation_type: str | AnnotationType) -> type[Annotati
         The Annotation type that corresponds with `annotation_type`.
     """
     annotation_type = annotation_type.lower()
-    if annotation_type == AnnotationType.CLASSIFICATION:
-        return ClassificationAnnotation
-    elif annotation_type == AnnotationType.SEGMENTATION:
-        return SegmentationAnnotation
-    elif annotation_type == AnnotationType.OBJECT_DETECTION:
-        return ObjectDetectionAnnotation
-    raise ValueError(f"Could not find annotation model for type '{annotation_type}'")
+    try:
+        return _ANNOTATION_MODELS[annotation_type]
+    except KeyError:
+        raise ValueError(
+            f"Could not find annotation model for type '{annotation_type}'"
+        ) from None
+
+
+_ANNOTATION_MODELS: dict[str, type[Annotation]] = {
+    AnnotationType.CLASSIFICATION.value: ClassificationAnnotation,
+    AnnotationType.SEGMENTATION.value: SegmentationAnnotation,
+    AnnotationType.OBJECT_DETECTION.value: ObjectDetectionAnnotation,
+}
 
 
 class UpdateAnnotation(BaseModel):
@@ -274,6 +320,10 @@ class UpdateAnnotation(BaseModel):
 
     @model_validator(mode="after")
     def verify_types(self):
+        # most updates only change the label or confidence
+        if self.bbox is None and self.points is None:
+            return self
+
         has_bbox = self.bbox is not None
         has_points = self.points is not None
 
@@ -281,7 +331,7 @@ class UpdateAnnotation(BaseModel):
             raise ValueError(
                 "Cannot set both bbox and points! They are mutually exclusive."
             )
-        elif (has_bbox or has_points) and self.type == AnnotationType.CLASSIFICATION:
+        elif (has_bbox or has_points) and self.type is AnnotationType.CLASSIFICATION:
             raise ValueError(
                 "Cannot set bbox or points when explicitly converting annotation to classification!"
             )
@@ -317,7 +367,7 @@ class _FileMetaBase(HasCreatedBy, HasCreatedAt, HasProjectID, HasFileID):
     status: FileStatus = FileStatus.UNANNOTATED
 
     @classmethod
-    def from_grid_out(cls, grid_out: gridfs.GridOut) -> type[Self]:
+    def from_grid_out(cls, grid_out: gridfs.GridOut) -> Self:
         return cls(
             **grid_out.metadata,
             fileId=grid_out._id,
@@ -362,13 +412,19 @@ def get_filemeta_model(content_type: str) -> type[FileMeta]:
     Returns:
         The FileMeta type that corresponds with `contentType`.
     """
-    if content_type.startswith("image"):
-        return ImageMeta
-    elif content_type.startswith("video"):
-        return VideoMeta
-    elif content_type.startswith("text"):
-        return TextMeta
-    raise ValueError(f"Could not find metadata model for type '{content_type}'")
+    try:
+        return _FILEMETA_MODELS_BY_MIME[content_type.split("/", 1)[0]]
+    except KeyError:
+        raise ValueError(
+            f"Could not find metadata model for type '{content_type}'"
+        ) from None
+
+
+_FILEMETA_MODELS_BY_MIME: dict[str, type[FileMeta]] = {
+    DataType.IMAGE.value: ImageMeta,
+    DataType.VIDEO.value: VideoMeta,
+    DataType.TEXT.value: TextMeta,
+}
 
 
 # PROJECTS
@@ -392,6 +448,26 @@ class ProjectSettings(BaseModel):
     labels: list[str] = Field([])
 
 
+class UpdateProjectSettings(ForbidExtra):
+    """Intended use: update.model_dump(exclude_unset=True)
+
+    Partial counterpart of ProjectSettings; unset fields are left untouched.
+    """
+
+    dataType: DataType | None = None
+    annotatationType: AnnotationType | None = None
+    isPublic: bool = False
+    labels: list[str] = Field([])
+
+    @field_validator("dataType", "annotatationType")
+    @classmethod
+    def _reject_null(cls, value: Any) -> Any:
+        # required on ProjectSettings, so these may be omitted but never cleared
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
+
+
 class BaseProject(HasCreatedBy, HasCreatedAt, HasUpdatedAt):
     name: str
     description: str
@@ -409,7 +485,7 @@ class ProjectWithFiles(Project):
     @computed_field
     @property
     def numAnnotated(self) -> int:
-        return sum([1 for f in self.files if f.status == FileStatus.ANNOTATED])
+        return sum(1 for f in self.files if f.status is FileStatus.ANNOTATED)
 
     @computed_field
     @property
@@ -423,7 +499,7 @@ class ProjectWithFiles(Project):
 class UserNoPassword(HasCreatedAt, HasRoleID):
 
     username: str
-    email: EmailStr
+    email: Email
     firstName: str
     lastName: str
     lastLogin: datetime.datetime | None = None
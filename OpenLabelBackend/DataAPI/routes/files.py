@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-import base64
 import logging
+from io import BytesIO
 from typing import Final
 
+import pybase64
 from DataAPI import db
 from DataAPI.auth_utils import auth_user
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from .. import exceptions as exc
 from .. import models
@@ -92,7 +95,7 @@ def download_file(
     """
     # TODO: auth (may have to dig into project roles, etc.)
 
-    download = db.file.download_file(file_id)
+    download = db.file.download_file(file_id, BytesIO())
 
     if download is None:
         raise HTTPException(
@@ -103,7 +106,7 @@ def download_file(
 
     encoded_data = None
     if meta.contentType.startswith("image"):
-        encoded_data = base64.b64encode(data.getvalue()).decode()
+        encoded_data = pybase64.b64encode(data.getvalue()).decode("ascii")
     elif meta.contentType.startswith("text"):
         encoded_data = data.getvalue().decode("utf-8")
 
@@ -112,6 +115,42 @@ def download_file(
     return models.File(data=encoded_data, metadata=meta, annotations=annotations)
 
 
+@router.get("/{file_id}/raw")
+def download_file_raw(
+    file_id: models.ID,
+    auth_token: models.TokenPayload = Depends(auth_user),
+) -> StreamingResponse:
+    """Streams the raw contents of the specified file.
+
+    Args:
+        file_id: The ID of the file to download.
+        auth_token: Auth token taken from the Authorization header.
+
+    Raises:
+        HTTPException: 404; if the specified file does not exist.
+
+    Returns:
+        The file's bytes, with the file's MIME type as the content type.
+    """
+    # TODO: auth (may have to dig into project roles, etc.)
+
+    download = db.file.open_file_stream(file_id)
+
+    if download is None:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND, f"File with ID '{str(file_id)}' not found"
+        )
+
+    stream, meta = download
+
+    # iterating a GridOut directly yields lines, so send it one GridFS chunk at a time
+    return StreamingResponse(
+        iter(stream.readchunk, b""),
+        media_type=meta.contentType,
+        background=BackgroundTask(stream.close),
+    )
+
+
 @router.get("/{file_id}/annotations")
 def get_file_annotations(
     file_id: models.ID,
@@ -164,14 +203,14 @@ def create_file_annotation(
 
     annotation_id: models.ID
 
-    if annotation.type == models.AnnotationType.CLASSIFICATION:
+    if annotation.type is models.AnnotationType.CLASSIFICATION:
         annotation_id = db.annotation.create_classification_annotation(
             file_id=file_id,
             project_id=file_meta.projectId,
             created_by=auth_token.userId,
             label=annotation.label,
         )
-    elif annotation.type == models.AnnotationType.OBJECT_DETECTION:
+    elif annotation.type is models.AnnotationType.OBJECT_DETECTION:
         annotation_id = db.annotation.create_object_detection_annotation(
             file_id=file_id,
             project_id=file_meta.projectId,
@@ -179,7 +218,7 @@ def create_file_annotation(
             label=annotation.label,
             bbox=annotation.bbox,
         )
-    elif annotation.type == models.AnnotationType.SEGMENTATION:
+    elif annotation.type is models.AnnotationType.SEGMENTATION:
         annotation_id = db.annotation.create_segmentation_annotation(
             file_id=file_id,
             project_id=file_meta.projectId,
@@ -108,7 +108,8 @@ def get_project_by_id(
     #         status.HTTP_403_FORBIDDEN, "Insufficient permissions to view this object."
     #     )
 
-    return dict(**project.model_dump(), files=files)
+    # both parts are already validated models, so skip validating them a second time
+    return models.ProjectWithFiles.model_construct(**dict(project), files=files)
 
 
 @router.patch("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -291,9 +292,9 @@ def get_project_images(
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Project not found.")
 
     if format is None:
-        if project.settings.dataType == models.DataType.IMAGE:
+        if project.settings.dataType is models.DataType.IMAGE:
             format = models.ExportFormat.COCO
-        elif project.settings.dataType == models.DataType.TEXT:
+        elif project.settings.dataType is models.DataType.TEXT:
             format = models.ExportFormat.CLASSIFICATION
         else:
             raise HTTPException(
@@ -108,17 +108,18 @@ def get_user_by_id(auth_token: models.TokenPayload = Depends(auth_user)):
 
 
 @router.get("")
-def get_users(limit: int = 100) -> list[models.UserNoPasswordWithID]:
+def get_users(limit: int = 100, skip: int = 0) -> list[models.UserNoPasswordWithID]:
     """Gets a list of all users.
 
     Args:
         limit: The maximum number of users to return. Defaults to 100.
+        skip: The number of users to skip, for paging through results. Defaults to 0.
 
     Returns:
         A list of users matching the provided parameters.
     """
 
-    users = db.user.get_users(limit)
+    users = db.user.get_users(limit, skip)
 
     return users
 
@@ -139,10 +140,10 @@ def get_user_by_id(
     """
     # TODO: auth stuff (if needed, else delete auth_token arg)
 
-    user = db.user.get_user_by_id(ObjectId(user_id))
+    user = db.user.get_user_model_by_id(ObjectId(user_id))
 
     if user is None:
-        HTTPException(status.HTTP_404_NOT_FOUND, "Could not find requested user.")
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Could not find requested user.")
 
     return user
 
@@ -252,8 +253,4 @@ def get_user_projects(
     """
     # TODO: do auth by comparing permissions of auth_token to the user being modified (user_id) perhaps??
 
-    projects = db.project.get_projects_by_user(user_id)
-
-    return filter(
-        lambda p: owner is None or ((p["createdBy"] == user_id) == owner), projects
-    )
+    return db.project.get_projects_by_user(user_id, owner)
@@ -20,32 +20,36 @@ def init_test_data():
     project1_labels = ["bird", "cat", "dog", "lynx", "fish"]
     project2_labels = ["happy", "sad", "glad", "disappointed", "mad"]
 
-    project1_id = db.project.create_project(
-        name="Default Project 1",
-        description="This is a default project for image object-detection.",
-        created_by=admin_id,
-        is_public=True,
-        data_type=models.DataType.IMAGE,
-        annotation_type=models.AnnotationType.OBJECT_DETECTION,
-        labels=project1_labels,
-    )
-    project2_id = db.project.create_project(
-        name="Default Project 2",
-        description="This is a default project for text classification.",
-        created_by=admin_id,
-        is_public=True,
-        data_type=models.DataType.TEXT,
-        annotation_type=models.AnnotationType.CLASSIFICATION,
-        labels=project2_labels,
-    )
-    project3_id = db.project.create_project(
-        name="Default Project 3",
-        description="This is a default project for image classification.",
-        created_by=admin_id,
-        is_public=True,
-        data_type=models.DataType.IMAGE,
-        annotation_type=models.AnnotationType.CLASSIFICATION,
-        labels=["car", "bike", "shirt"],
+    project1_id, project2_id, project3_id = db.project.create_projects(
+        [
+            dict(
+                name="Default Project 1",
+                description="This is a default project for image object-detection.",
+                created_by=admin_id,
+                is_public=True,
+                data_type=models.DataType.IMAGE,
+                annotation_type=models.AnnotationType.OBJECT_DETECTION,
+                labels=project1_labels,
+            ),
+            dict(
+                name="Default Project 2",
+                description="This is a default project for text classification.",
+                created_by=admin_id,
+                is_public=True,
+                data_type=models.DataType.TEXT,
+                annotation_type=models.AnnotationType.CLASSIFICATION,
+                labels=project2_labels,
+            ),
+            dict(
+                name="Default Project 3",
+                description="This is a default project for image classification.",
+                created_by=admin_id,
+                is_public=True,
+                data_type=models.DataType.IMAGE,
+                annotation_type=models.AnnotationType.CLASSIFICATION,
+                labels=["car", "bike", "shirt"],
+            ),
+        ]
     )
 
     image_folder = Path(__file__).resolve().parents[1] / "test_data"